@@ -0,0 +1 @@
+# Permite importar los módulos del portal desde tests/ al ejecutar pytest
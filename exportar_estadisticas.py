@@ -0,0 +1,308 @@
+"""
+Exportación de estadísticas del curso a Excel (XLSX) o CSV.
+
+Recorre el archivo de notas fila por fila (openpyxl en modo solo lectura) y
+acumula solo agregados: promedios, máximos, mínimos, aprobados, distribución
+por carrera y un histograma anónimo por evaluación. El resultado se escribe en
+modo streaming (openpyxl en modo solo escritura o el módulo csv), por lo que la
+memoria usada no crece con el número de estudiantes.
+
+Uso desde la línea de comandos:
+    python exportar_estadisticas.py notas_estudiantes.xlsx -o estadisticas.xlsx
+    python exportar_estadisticas.py notas_*.xlsx -o estadisticas.csv
+"""
+
+import argparse
+import csv
+import io
+import math
+import sys
+import zipfile
+from collections import Counter
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+# Columnas que no son evaluaciones (mismas que usa el portal)
+COLUMNAS_INFO = ['CEDULA', 'NOMBRE', 'APELLIDO', 'EMAIL', 'CARRERA', 'NOTA FINAL', 'PROGRESO (%)', 'ESTADO']
+
+# Nombres alternativos de columnas que el portal normaliza al cargar
+RENOMBRAR_COLUMNAS = {
+    'CÉDULA': 'CEDULA',
+    'NOMBRES': 'NOMBRE',
+    'APELLIDOS': 'APELLIDO',
+    'LICENCIATURA': 'CARRERA',
+    'CORREO': 'EMAIL',
+}
+
+NOTA_APROBACION = 10
+NOTA_MAXIMA = 20
+
+# Rangos del histograma anónimo: [0-1), [1-2), ..., [19-20]
+RANGOS_NOTAS = [f"{i}-{i + 1}" for i in range(NOTA_MAXIMA)]
+
+# Función para convertir un valor de celda a nota numérica
+def _a_numero(valor):
+    """Equivalente a pd.to_numeric(errors='coerce') para un solo valor"""
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        numero = float(valor)
+    else:
+        try:
+            numero = float(str(valor).strip().replace(',', '.'))
+        except ValueError:
+            return None
+    return None if math.isnan(numero) else numero
+
+def _rango_nota(nota):
+    """Índice del rango del histograma al que pertenece una nota"""
+    return min(max(int(nota), 0), NOTA_MAXIMA - 1)
+
+class _Acumulador:
+    """Acumula promedio, máxima, mínima, aprobados e histograma de una columna"""
+
+    def __init__(self):
+        self.cantidad = 0
+        self.suma = 0.0
+        self.maxima = None
+        self.minima = None
+        self.aprobados = 0
+        self.histograma = [0] * NOTA_MAXIMA
+
+    def agregar(self, nota):
+        self.cantidad += 1
+        self.suma += nota
+        self.maxima = nota if self.maxima is None else max(self.maxima, nota)
+        self.minima = nota if self.minima is None else min(self.minima, nota)
+        if nota >= NOTA_APROBACION:
+            self.aprobados += 1
+        self.histograma[_rango_nota(nota)] += 1
+
+    @property
+    def promedio(self):
+        return self.suma / self.cantidad if self.cantidad else None
+
+# Función para leer las filas del archivo de notas sin cargarlo completo
+def iterar_filas(ruta_archivo):
+    """Genera un diccionario por estudiante con los nombres de columnas normalizados"""
+    try:
+        libro = load_workbook(ruta_archivo, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile) as e:
+        # p. ej. archivos .xls antiguos, que openpyxl no puede leer
+        raise ValueError(f"El archivo '{ruta_archivo}' no es un Excel .xlsx válido: {e}") from e
+    try:
+        hoja = libro.active
+        filas = hoja.iter_rows(values_only=True)
+
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return
+        columnas = []
+        for valor in encabezado:
+            nombre = str(valor).strip() if valor is not None else ''
+            columnas.append(RENOMBRAR_COLUMNAS.get(nombre, nombre))
+
+        if 'CEDULA' not in columnas:
+            raise ValueError(f"El archivo '{ruta_archivo}' debe contener una columna de identificación (CÉDULA o CEDULA)")
+
+        for fila in filas:
+            if all(valor is None for valor in fila):
+                continue
+            yield {columna: valor for columna, valor in zip(columnas, fila) if columna}
+    finally:
+        libro.close()
+
+def iterar_archivos(rutas_archivos):
+    """Encadena las filas de varios archivos de notas (p. ej. toda una facultad)"""
+    for ruta in rutas_archivos:
+        yield from iterar_filas(ruta)
+
+# Función para calcular las estadísticas en una sola pasada
+def calcular_estadisticas_streaming(filas):
+    """Calcula las estadísticas del curso a partir de un iterable de filas.
+
+    Devuelve un diccionario con las mismas claves que
+    calcular_estadisticas_generales() del portal, más el histograma anónimo de
+    cada evaluación en 'distribucion'.
+    """
+    total = 0
+    estados = Counter()
+    carreras = Counter()
+    nota_final = _Acumulador()
+    # La mediana se calcula con las notas redondeadas a 2 decimales (a lo sumo 2001
+    # valores), así que es aproximada: error máximo de 0.005 puntos
+    frecuencias_nota_final = Counter()
+    evaluaciones = {}
+
+    for fila in filas:
+        total += 1
+
+        if 'ESTADO' in fila:
+            estados[fila['ESTADO']] += 1
+        if fila.get('CARRERA') is not None:
+            carreras[fila['CARRERA']] += 1
+
+        nota = _a_numero(fila.get('NOTA FINAL'))
+        if nota is not None:
+            nota_final.agregar(nota)
+            frecuencias_nota_final[round(nota, 2)] += 1
+
+        for columna, valor in fila.items():
+            if columna in COLUMNAS_INFO:
+                continue
+            acumulador = evaluaciones.setdefault(columna, _Acumulador())
+            nota = _a_numero(valor)
+            if nota is not None:
+                acumulador.agregar(nota)
+
+    estadisticas = {'total_estudiantes': total}
+
+    if estados:
+        estadisticas['estudiantes_activos'] = estados['Activo']
+        estadisticas['estudiantes_retirados'] = estados['Retirado']
+
+    if nota_final.cantidad > 0:
+        estadisticas['nota_promedio'] = nota_final.promedio
+        estadisticas['nota_maxima'] = nota_final.maxima
+        estadisticas['nota_minima'] = nota_final.minima
+        estadisticas['nota_mediana'] = _mediana(frecuencias_nota_final, nota_final.cantidad)
+        estadisticas['aprobados'] = nota_final.aprobados
+        estadisticas['porcentaje_aprobados'] = (nota_final.aprobados / nota_final.cantidad) * 100
+
+    if carreras:
+        estadisticas['distribucion_carreras'] = dict(carreras.most_common())
+
+    estadisticas['evaluaciones'] = {}
+    estadisticas['distribucion'] = {}
+    for columna, acumulador in evaluaciones.items():
+        if acumulador.cantidad == 0:
+            continue
+        estadisticas['evaluaciones'][columna] = {
+            'promedio': acumulador.promedio,
+            'maxima': acumulador.maxima,
+            'minima': acumulador.minima,
+            'estudiantes_calificados': acumulador.cantidad,
+            'aprobados': acumulador.aprobados,
+            'porcentaje_aprobados': (acumulador.aprobados / acumulador.cantidad) * 100,
+        }
+        estadisticas['distribucion'][columna] = acumulador.histograma
+
+    return estadisticas
+
+def _mediana(frecuencias, cantidad):
+    """Mediana a partir de un conteo de frecuencias por valor"""
+    posiciones = [(cantidad - 1) // 2, cantidad // 2]
+    valores = []
+    acumulado = 0
+    for valor in sorted(frecuencias):
+        acumulado += frecuencias[valor]
+        while posiciones and posiciones[0] < acumulado:
+            valores.append(valor)
+            posiciones.pop(0)
+        if not posiciones:
+            break
+    return sum(valores) / 2
+
+# Filas de cada tabla de la exportación
+def _filas_resumen(estadisticas):
+    etiquetas = [
+        ('total_estudiantes', 'Total de estudiantes'),
+        ('estudiantes_activos', 'Estudiantes activos'),
+        ('estudiantes_retirados', 'Estudiantes retirados'),
+        ('nota_promedio', 'Promedio general'),
+        ('nota_maxima', 'Nota máxima'),
+        ('nota_minima', 'Nota mínima'),
+        ('nota_mediana', 'Mediana (aprox. ±0.005)'),
+        ('aprobados', 'Estudiantes aprobados'),
+        ('porcentaje_aprobados', 'Porcentaje de aprobados'),
+    ]
+    for clave, etiqueta in etiquetas:
+        if clave in estadisticas:
+            yield [etiqueta, estadisticas[clave]]
+
+def _filas_carreras(estadisticas):
+    for carrera, cantidad in estadisticas.get('distribucion_carreras', {}).items():
+        yield [carrera, cantidad]
+
+def _filas_evaluaciones(estadisticas):
+    for evaluacion, stats in estadisticas['evaluaciones'].items():
+        yield [evaluacion, stats['promedio'], stats['maxima'], stats['minima'],
+               stats['estudiantes_calificados'], stats['aprobados'], stats['porcentaje_aprobados']]
+
+def _filas_distribucion(estadisticas):
+    for evaluacion, histograma in estadisticas['distribucion'].items():
+        yield [evaluacion] + histograma
+
+TABLAS = [
+    ('Resumen', ['Indicador', 'Valor'], _filas_resumen),
+    ('Carreras', ['Carrera', 'Estudiantes'], _filas_carreras),
+    ('Evaluaciones', ['Evaluación', 'Promedio', 'Máxima', 'Mínima', 'Calificados', 'Aprobados', '% Aprobados'],
+     _filas_evaluaciones),
+    ('Distribución', ['Evaluación'] + RANGOS_NOTAS, _filas_distribucion),
+]
+
+# Funciones de escritura
+def escribir_xlsx(estadisticas, destino):
+    """Escribe las estadísticas en un XLSX en modo solo escritura (memoria constante)"""
+    libro = Workbook(write_only=True)
+    for titulo, encabezado, generar_filas in TABLAS:
+        hoja = libro.create_sheet(titulo)
+        hoja.append(encabezado)
+        for fila in generar_filas(estadisticas):
+            hoja.append(fila)
+    libro.save(destino)
+
+def escribir_csv(estadisticas, destino):
+    """Escribe las estadísticas en un CSV en formato largo: tabla, clave, métrica, valor"""
+    escritor = csv.writer(destino)
+    escritor.writerow(['tabla', 'clave', 'metrica', 'valor'])
+    for titulo, encabezado, generar_filas in TABLAS:
+        for fila in generar_filas(estadisticas):
+            # En el resumen cada fila ya es una métrica; en las demás tablas la
+            # primera columna es la clave (carrera o evaluación)
+            if titulo == 'Resumen':
+                escritor.writerow([titulo, '', fila[0], fila[1]])
+            else:
+                for metrica, valor in zip(encabezado[1:], fila[1:]):
+                    escritor.writerow([titulo, fila[0], metrica, valor])
+
+def serializar_estadisticas(estadisticas, formato='xlsx'):
+    """Devuelve las estadísticas ya calculadas como archivo XLSX o CSV en bytes"""
+    if formato == 'xlsx':
+        destino = io.BytesIO()
+        escribir_xlsx(estadisticas, destino)
+        return destino.getvalue()
+    if formato == 'csv':
+        destino = io.StringIO()
+        escribir_csv(estadisticas, destino)
+        return destino.getvalue().encode('utf-8-sig')
+    raise ValueError(f"Formato no soportado: {formato}")
+
+def exportar(rutas_archivos, formato='xlsx'):
+    """Calcula las estadísticas de uno o varios archivos y devuelve el archivo exportado en bytes"""
+    estadisticas = calcular_estadisticas_streaming(iterar_archivos(rutas_archivos))
+    return serializar_estadisticas(estadisticas, formato)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta las estadísticas del curso a XLSX o CSV")
+    parser.add_argument("archivos", nargs="+", help="Archivo(s) de notas en formato Excel")
+    parser.add_argument("-o", "--salida", required=True, help="Archivo de salida (.xlsx o .csv)")
+    parser.add_argument("--formato", choices=["xlsx", "csv"], help="Formato de salida (por defecto, según la extensión)")
+    args = parser.parse_args()
+
+    formato = args.formato or ('csv' if args.salida.lower().endswith('.csv') else 'xlsx')
+
+    try:
+        estadisticas = calcular_estadisticas_streaming(iterar_archivos(args.archivos))
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if formato == 'xlsx':
+        escribir_xlsx(estadisticas, args.salida)
+    else:
+        with open(args.salida, 'w', newline='', encoding='utf-8-sig') as f:
+            escribir_csv(estadisticas, f)
+
+    print(f"✅ Estadísticas de {estadisticas['total_estudiantes']} estudiantes exportadas a {args.salida}")
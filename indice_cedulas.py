@@ -0,0 +1,187 @@
+"""
+Índice de cédulas tolerante a errores de tipeo.
+
+Encuentra las cédulas a distancia de edición 1-2 (inserción,
+eliminación, sustitución o transposición de dígitos vecinos) de la que escribió
+el estudiante, sin recorrer toda la lista. Se construye una vez al cargar el
+archivo de notas.
+
+Se usa un índice de eliminaciones simétricas en lugar de un árbol BK: las
+cédulas son cadenas de ~8 dígitos casi equidistantes entre sí (distancia ~7),
+y con esa distribución el árbol BK no logra podar y termina visitando casi
+todos los nodos en cada consulta.
+"""
+
+import re
+
+# Función para normalizar una cédula
+def normalizar_cedula(cedula):
+    """Deja la nacionalidad (V o E) y los dígitos de la cédula (quita puntos, guiones y espacios).
+
+    'V-12.345.678' y 'E-12.345.678' son personas distintas, así que la letra se
+    conserva: quedan como 'V12345678' y 'E12345678'. Sin letra queda '12345678'.
+    """
+    if cedula is None:
+        return ''
+    texto = str(cedula).strip().upper()
+    # Las cédulas leídas como número pueden venir como '12345678.0'
+    if texto.endswith('.0') and texto[:-2].isdigit():
+        texto = texto[:-2]
+    digitos = re.sub(r'\D', '', texto)
+    if not digitos:
+        return texto
+    nacionalidad = re.match(r'([VE])[\s.\-]*\d', texto)
+    return (nacionalidad.group(1) if nacionalidad else '') + digitos
+
+def _separar_cedula(clave):
+    """Separa una cédula normalizada en (nacionalidad, número)"""
+    if clave[:1] in ('V', 'E') and clave[1:].isdigit():
+        return clave[0], clave[1:]
+    return '', clave
+
+# Función para comparar dos cédulas normalizadas
+def cedulas_compatibles(a, b):
+    """Mismo número y misma nacionalidad, o nacionalidad ausente en alguna de las dos"""
+    nacionalidad_a, numero_a = _separar_cedula(a)
+    nacionalidad_b, numero_b = _separar_cedula(b)
+    return numero_a == numero_b and (nacionalidad_a == nacionalidad_b or not nacionalidad_a or not nacionalidad_b)
+
+# Función de distancia entre dos cédulas
+def distancia_acotada(a, b, limite):
+    """Distancia de edición con transposición de vecinos (Damerau-Levenshtein restringida).
+
+    Solo interesa saber si es <= limite: en cuanto una fila completa supera el
+    límite se deja de calcular y se devuelve limite + 1.
+    """
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+
+    fila_previa = None
+    fila_anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        fila = [i] + [0] * len(b)
+        minimo = i
+        for j in range(1, len(b) + 1):
+            costo = 0 if a[i - 1] == b[j - 1] else 1
+            valor = min(
+                fila_anterior[j] + 1,            # eliminación
+                fila[j - 1] + 1,                 # inserción
+                fila_anterior[j - 1] + costo,    # sustitución
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                valor = min(valor, fila_previa[j - 2] + 1)  # transposición
+            fila[j] = valor
+            minimo = min(minimo, valor)
+        if minimo > limite:
+            return limite + 1
+        fila_previa, fila_anterior = fila_anterior, fila
+
+    return min(fila_anterior[-1], limite + 1)
+
+# Función para generar las variantes por eliminación de una cédula
+def _variantes_por_eliminacion(texto, maximo):
+    """Todas las cadenas que se obtienen quitando hasta 'maximo' caracteres (incluye el texto original)"""
+    variantes = {texto}
+    nivel = {texto}
+    for _ in range(maximo):
+        siguiente = set()
+        for variante in nivel:
+            if len(variante) <= 1:
+                continue
+            for i in range(len(variante)):
+                siguiente.add(variante[:i] + variante[i + 1:])
+        variantes |= siguiente
+        nivel = siguiente
+    return variantes
+
+class IndiceCedulas:
+    """Índice de eliminaciones simétricas sobre los números de cédula.
+
+    Si dos cadenas están a distancia <= k, existe una cadena común que se obtiene
+    quitando a lo sumo k caracteres de cada una. Por eso se indexan todas las
+    variantes con hasta 'distancia_maxima' eliminaciones y, al buscar, basta con
+    consultar las variantes de la cédula escrita y verificar los candidatos.
+
+    Se indexa solo el número; una nacionalidad distinta (V frente a E) cuenta
+    como una edición más.
+    """
+
+    def __init__(self, cedulas=(), distancia_maxima=2):
+        self.distancia_maxima = distancia_maxima
+        self.cedulas = set()
+        # número -> cédulas normalizadas con ese número (p. ej. 'V12345678' y 'E12345678')
+        self.numeros = {}
+        # variante -> número (str) o lista de números si varios comparten la variante
+        self.variantes = {}
+        for cedula in cedulas:
+            self.agregar(cedula)
+
+    def agregar(self, cedula):
+        cedula = normalizar_cedula(cedula)
+        if not cedula or cedula in self.cedulas:
+            return
+        self.cedulas.add(cedula)
+
+        _, numero = _separar_cedula(cedula)
+        if numero in self.numeros:
+            self.numeros[numero].append(cedula)
+            return
+        self.numeros[numero] = [cedula]
+
+        for variante in _variantes_por_eliminacion(numero, self.distancia_maxima):
+            actual = self.variantes.get(variante)
+            if actual is None:
+                self.variantes[variante] = numero
+            elif isinstance(actual, list):
+                actual.append(numero)
+            else:
+                self.variantes[variante] = [actual, numero]
+
+    def buscar(self, cedula, tolerancia=2):
+        """Devuelve [(distancia, cedula)] a distancia <= tolerancia, de la más cercana a la más lejana"""
+        cedula = normalizar_cedula(cedula)
+        if not cedula:
+            return []
+        tolerancia = min(tolerancia, self.distancia_maxima)
+        nacionalidad, numero = _separar_cedula(cedula)
+
+        candidatos = set()
+        for variante in _variantes_por_eliminacion(numero, tolerancia):
+            encontrados = self.variantes.get(variante)
+            if encontrados is None:
+                continue
+            if isinstance(encontrados, list):
+                candidatos.update(encontrados)
+            else:
+                candidatos.add(encontrados)
+
+        resultados = []
+        for candidato in candidatos:
+            distancia_numero = distancia_acotada(numero, candidato, tolerancia)
+            for candidata in self.numeros[candidato]:
+                otra_nacionalidad, _ = _separar_cedula(candidata)
+                distancia = distancia_numero
+                if nacionalidad and otra_nacionalidad and nacionalidad != otra_nacionalidad:
+                    distancia += 1
+                if distancia <= tolerancia:
+                    resultados.append((distancia, candidata))
+
+        resultados.sort()
+        return resultados
+
+    def sugerencias(self, cedula, tolerancia_maxima=2):
+        """Cédulas a la menor distancia encontrada.
+
+        Si la cédula normalizada está en el índice (distancia 0) se devuelve solo
+        esa: es la misma cédula escrita de otra forma (con puntos, guiones, etc.).
+        Una cédula sin nacionalidad está a distancia 0 de la V y de la E con el
+        mismo número, y se devuelven ambas.
+        """
+        cercanas = self.buscar(cedula, tolerancia_maxima)
+        if not cercanas:
+            return []
+        minima = cercanas[0][0]
+        return [valor for distancia, valor in cercanas if distancia == minima]
+
+    def __len__(self):
+        return len(self.cedulas)
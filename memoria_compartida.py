@@ -0,0 +1,237 @@
+"""
+Matriz de notas compartida entre varios procesos del portal.
+
+Cuando se ejecutan varios procesos de Streamlit en el mismo servidor, cada uno
+cargaba su propia copia del archivo de notas. Con este módulo el primer proceso
+publica las notas en un archivo mapeado en memoria (en /dev/shm si existe):
+
+    [cabecera][matriz de notas float32 (estudiantes x columnas numéricas)][columnas de identidad]
+
+Las columnas de identidad (cédula, nombre, correo, ...) se guardan con el
+formato de cadenas de Arrow: máscara de nulos, posiciones int64 y texto UTF-8.
+Los demás procesos lo abren con np.memmap y obtienen vistas NumPy y Arrow sin
+copiar los datos, así que la memoria de las notas no crece con el número de
+procesos.
+Para recargar, se escribe un archivo nuevo y se reemplaza con os.replace(), que
+es atómico: los procesos que ya tenían el archivo anterior mapeado lo siguen
+usando sin problemas hasta que vuelven a adjuntarse.
+
+Se usa un archivo mapeado en vez de multiprocessing.shared_memory porque, en
+Python < 3.13, el resource_tracker elimina el segmento cuando termina cualquier
+proceso que se haya adjuntado a él.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Configuración del archivo compartido
+DIRECTORIO_COMPARTIDO = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+FIRMA = b"NOTASPE2"
+ALINEACION = 64
+_FORMATO_PREFIJO = "<8sQ"  # firma + longitud de la cabecera JSON
+_TAMANO_PREFIJO = struct.calcsize(_FORMATO_PREFIJO)
+
+# Columnas que siempre se guardan como texto aunque parezcan numéricas
+COLUMNAS_IDENTIDAD = ['CEDULA', 'NOMBRE', 'APELLIDO', 'EMAIL', 'CARRERA', 'ESTADO']
+
+# Texto de pandas respaldado por Arrow, con NaN como valor faltante (igual que al leer el Excel)
+TIPO_TEXTO = pd.StringDtype("pyarrow", na_value=np.nan)
+
+def _alinear(posicion):
+    return (posicion + ALINEACION - 1) // ALINEACION * ALINEACION
+
+# Función para obtener la ruta del archivo compartido de un archivo de notas
+def ruta_segmento(archivo_origen):
+    """Ruta del archivo compartido para un archivo de notas.
+
+    El nombre depende de la ruta absoluta del archivo de notas, así dos cursos en
+    el mismo servidor no se sobrescriben. PORTAL_SEGMENTO_NOTAS permite fijarla.
+    """
+    if os.environ.get("PORTAL_SEGMENTO_NOTAS"):
+        return os.environ["PORTAL_SEGMENTO_NOTAS"]
+    huella = hashlib.sha1(os.path.abspath(archivo_origen).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(DIRECTORIO_COMPARTIDO, f"portal_notas_{huella}.bin")
+
+def _es_columna_de_notas(serie):
+    """Columnas numéricas, o de texto con al menos una nota (p. ej. 15.0 y 'NP')"""
+    if pd.api.types.is_numeric_dtype(serie):
+        return True
+    return pd.to_numeric(serie, errors='coerce').notna().any()
+
+# Función para publicar las notas en el archivo compartido
+def publicar_notas(df, archivo_origen, origen_modificado, ruta=None):
+    """Escribe la matriz de notas y las columnas de identidad y reemplaza el archivo compartido.
+
+    origen_modificado es la fecha de modificación del archivo de notas tomada
+    antes de leerlo, para que una versión leída a medias nunca parezca vigente.
+    """
+    ruta = ruta or ruta_segmento(archivo_origen)
+    df = df.rename(columns=str)
+    columnas = list(df.columns)
+    numericas = [
+        col for col in columnas
+        if col not in COLUMNAS_IDENTIDAD and _es_columna_de_notas(df[col])
+    ]
+    identidad = [col for col in columnas if col not in numericas]
+
+    # Los valores de texto en columnas de notas ('NP', 'AUS', ...) quedan como NaN
+    matriz = np.empty((len(df), len(numericas)), dtype=np.float32)
+    for j, col in enumerate(numericas):
+        matriz[:, j] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float32, na_value=np.nan)
+
+    # Las columnas de texto se guardan como buffers de Arrow (los vacíos quedan como nulos)
+    buffers_identidad = {}
+    for col in identidad:
+        valores = [None if pd.isna(v) else str(v) for v in df[col]]
+        arreglo = pa.array(valores, type=pa.large_string())
+        validez, posiciones, datos = arreglo.buffers()
+        buffers_identidad[col] = (arreglo.null_count, {
+            'validez': validez,
+            'posiciones': posiciones,
+            'datos': datos,
+        })
+
+    # Las posiciones de los arreglos son relativas al inicio de los datos, que va
+    # justo después de la cabecera (alineado)
+    cabecera = {
+        'origen': os.path.abspath(archivo_origen),
+        'origen_modificado': origen_modificado,
+        'filas': len(df),
+        'columnas': columnas,
+        'numericas': numericas,
+        'identidad': {},
+    }
+    posicion = 0
+    cabecera['matriz'] = {'offset': posicion, 'forma': list(matriz.shape)}
+    posicion = _alinear(posicion + matriz.nbytes)
+    for col, (nulos, buffers) in buffers_identidad.items():
+        cabecera['identidad'][col] = {'nulos': nulos}
+        for nombre, buffer in buffers.items():
+            if buffer is None:
+                # Sin nulos, Arrow no necesita la máscara de validez
+                cabecera['identidad'][col][nombre] = None
+                continue
+            cabecera['identidad'][col][nombre] = {'offset': posicion, 'bytes': buffer.size}
+            posicion = _alinear(posicion + buffer.size)
+
+    datos_cabecera = json.dumps(cabecera).encode('utf-8')
+    inicio_datos = _alinear(_TAMANO_PREFIJO + len(datos_cabecera))
+
+    # Escribir en un archivo temporal del mismo directorio y reemplazar de forma atómica.
+    # mkstemp crea el archivo con permisos 0600: contiene nombres, cédulas y correos
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, ruta_temporal = tempfile.mkstemp(prefix=".notas_", dir=directorio)
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(struct.pack(_FORMATO_PREFIJO, FIRMA, len(datos_cabecera)))
+            f.write(datos_cabecera)
+            f.seek(inicio_datos + cabecera['matriz']['offset'])
+            f.write(matriz.tobytes())
+            for col, (_, buffers) in buffers_identidad.items():
+                for nombre, buffer in buffers.items():
+                    if buffer is not None:
+                        f.seek(inicio_datos + cabecera['identidad'][col][nombre]['offset'])
+                        f.write(buffer)
+            f.truncate(inicio_datos + posicion)
+        os.replace(ruta_temporal, ruta)
+    except BaseException:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+
+    return ruta
+
+def _leer_cabecera_de(datos):
+    """Lee la cabecera desde el inicio de un buffer; None si no es válida"""
+    try:
+        firma, longitud = struct.unpack_from(_FORMATO_PREFIJO, datos, 0)
+        if firma != FIRMA:
+            return None
+        cabecera = json.loads(bytes(datos[_TAMANO_PREFIJO:_TAMANO_PREFIJO + longitud]).decode('utf-8'))
+    except (struct.error, ValueError):
+        return None
+
+    cabecera['inicio_datos'] = _alinear(_TAMANO_PREFIJO + longitud)
+    return cabecera
+
+# Función para leer la cabecera del archivo compartido
+def leer_cabecera(ruta):
+    """Devuelve la cabecera del archivo compartido o None si no existe o no es válido"""
+    try:
+        with open(ruta, 'rb') as f:
+            prefijo = f.read(_TAMANO_PREFIJO)
+            _, longitud = struct.unpack(_FORMATO_PREFIJO, prefijo)
+            return _leer_cabecera_de(prefijo + f.read(longitud))
+    except (OSError, struct.error):
+        return None
+
+def cabecera_vigente(cabecera, archivo_origen):
+    """Indica si una cabecera corresponde a la versión actual del archivo de notas"""
+    if cabecera is None or not os.path.exists(archivo_origen):
+        return False
+    return (
+        cabecera['origen'] == os.path.abspath(archivo_origen)
+        and cabecera['origen_modificado'] == os.path.getmtime(archivo_origen)
+    )
+
+def segmento_vigente(archivo_origen):
+    """Indica si el archivo compartido corresponde a la versión actual del archivo de notas"""
+    return cabecera_vigente(leer_cabecera(ruta_segmento(archivo_origen)), archivo_origen)
+
+class SegmentoNotas:
+    """Una versión concreta del archivo compartido, abierta una sola vez.
+
+    La cabecera, el mapeo y el identificador salen del mismo descriptor, así que
+    un os.replace() concurrente no puede mezclar la cabecera de una versión con
+    los datos de otra.
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, 'rb') as f:
+            estado = os.fstat(f.fileno())
+            self.mapa = np.memmap(f, dtype=np.uint8, mode='r')
+        self.cabecera = _leer_cabecera_de(self.mapa)
+        if self.cabecera is None:
+            raise ValueError(f"'{ruta}' no es un archivo de notas compartido válido")
+        # Cambia cada vez que se reemplaza el archivo
+        self.identificador = (estado.st_dev, estado.st_ino, estado.st_mtime_ns, estado.st_size)
+
+# Función para adjuntarse al archivo compartido
+def adjuntar_notas(segmento):
+    """Construye el DataFrame de notas sobre el archivo compartido.
+
+    Las columnas numéricas forman un único bloque float32 y las de identidad son
+    cadenas de Arrow; todas son vistas de solo lectura del archivo mapeado (sin
+    copia).
+    """
+    cabecera = segmento.cabecera
+    mapa = segmento.mapa
+    filas = cabecera['filas']
+    inicio = cabecera['inicio_datos']
+
+    forma = tuple(cabecera['matriz']['forma'])
+    matriz = np.ndarray(forma, dtype=np.float32, buffer=mapa, offset=inicio + cabecera['matriz']['offset'])
+    df = pd.DataFrame(matriz, columns=cabecera['numericas'], copy=False)
+
+    # Insertar las columnas de identidad en su posición original sin tocar el bloque numérico
+    for posicion, col in enumerate(cabecera['columnas']):
+        if col not in cabecera['identidad']:
+            continue
+        info = cabecera['identidad'][col]
+        buffers = [
+            None if info[nombre] is None else
+            pa.py_buffer(mapa[inicio + info[nombre]['offset']:inicio + info[nombre]['offset'] + info[nombre]['bytes']])
+            for nombre in ('validez', 'posiciones', 'datos')
+        ]
+        arreglo = pa.Array.from_buffers(pa.large_string(), filas, buffers, null_count=info['nulos'])
+        df.insert(posicion, col, pd.array(arreglo, dtype=TIPO_TEXTO))
+
+    return df
@@ -3,8 +3,13 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import io
 from datetime import datetime
 import glob
+import unicodedata
+from exportar_estadisticas import calcular_estadisticas_streaming, iterar_filas, serializar_estadisticas
+from indice_cedulas import IndiceCedulas, cedulas_compatibles, normalizar_cedula
+import memoria_compartida
 
 # Configuración de la página
 st.set_page_config(
@@ -22,6 +27,10 @@ ARCHIVO_NOTAS = "notas_estudiantes.xlsx"  # Nombre del archivo predefinido
 ARCHIVO_BACKUP = "notas_estudiantes_backup.xlsx"  # Archivo alternativo
 PATRON_ARCHIVOS = "notas_estudiantes*.xlsx"  # Patrón para buscar archivos
 
+# Con PORTAL_MEMORIA_COMPARTIDA=1, varios procesos del portal en el mismo servidor
+# comparten una sola copia de la matriz de notas (ver memoria_compartida.py)
+USAR_MEMORIA_COMPARTIDA = os.environ.get("PORTAL_MEMORIA_COMPARTIDA") == "1"
+
 # Inicializar variables en session_state
 if 'df_notas' not in st.session_state:
     st.session_state.df_notas = None
@@ -31,6 +40,10 @@ if 'estadisticas_generales' not in st.session_state:
     st.session_state.estadisticas_generales = None
 if 'archivo_cargado' not in st.session_state:
     st.session_state.archivo_cargado = None
+if 'indice_cedulas' not in st.session_state:
+    st.session_state.indice_cedulas = None
+if 'cedulas_sugeridas' not in st.session_state:
+    st.session_state.cedulas_sugeridas = None
 
 # Función para buscar y cargar archivo automáticamente
 def buscar_y_cargar_archivo():
@@ -96,38 +109,100 @@ def cargar_archivo(ruta_archivo):
         if 'CORREO' in df.columns:
             df = df.rename(columns={'CORREO': 'EMAIL'})
         
-        # Asegurar que CEDULA sea string
+        # Asegurar que CEDULA sea string normalizado (una celda vacía hace que pandas
+        # lea la columna como float y las cédulas queden como '12345678.0')
         if 'CEDULA' in df.columns:
-            df['CEDULA'] = df['CEDULA'].astype(str)
+            df['CEDULA'] = df['CEDULA'].map(lambda c: normalizar_cedula(c) if pd.notna(c) else '')
         
         return df, ruta_archivo
     except Exception as e:
         st.error(f"Error al cargar el archivo '{ruta_archivo}': {str(e)}")
         return None, None
 
+# Función para cargar el archivo usando la memoria compartida entre procesos
+def cargar_archivo_compartido(ruta_archivo):
+    """Se adjunta a las notas publicadas por otro proceso o las publica si no están vigentes"""
+    try:
+        ruta_segmento = memoria_compartida.ruta_segmento(ruta_archivo)
+        for _ in range(2):
+            if not memoria_compartida.segmento_vigente(ruta_archivo):
+                # La fecha se toma antes de leer: si el profesor guarda el archivo
+                # mientras tanto, la versión publicada no queda como vigente
+                origen_modificado = os.path.getmtime(ruta_archivo)
+                df, _ = cargar_archivo(ruta_archivo)
+                if df is None:
+                    return None, None
+                memoria_compartida.publicar_notas(df, ruta_archivo, origen_modificado, ruta_segmento)
+            
+            # Otro proceso pudo reemplazar el archivo entre medio, así que se verifica
+            # el origen con la cabecera de la versión que realmente quedó abierta
+            segmento = memoria_compartida.SegmentoNotas(ruta_segmento)
+            if memoria_compartida.cabecera_vigente(segmento.cabecera, ruta_archivo):
+                return adjuntar_notas_compartidas(segmento.identificador, segmento), ruta_archivo
+    except Exception as e:
+        # p. ej. /dev/shm lleno o un archivo compartido de otro usuario
+        st.warning(f"No se pudo compartir el archivo '{ruta_archivo}' entre procesos ({str(e)}); se usa una copia propia")
+    
+    # Si no se logra una versión compartida coherente, se usa una copia propia
+    return cargar_archivo(ruta_archivo)
+
+# Todas las sesiones de un mismo proceso usan el mismo DataFrame (de solo lectura)
+@st.cache_resource(show_spinner=False, max_entries=2)
+def adjuntar_notas_compartidas(identificador, _segmento):
+    return memoria_compartida.adjuntar_notas(_segmento)
+
+# Índice de cédulas compartido por todas las sesiones (se reconstruye solo si cambia el archivo)
+@st.cache_resource(show_spinner=False, max_entries=2)
+def construir_indice_cedulas(ruta_archivo, fecha_modificacion, _cedulas):
+    return IndiceCedulas(_cedulas)
+
 # Función para buscar estudiante
 def buscar_estudiante(df, cedula, nombres=None, apellidos=None):
     """Busca un estudiante por cédula o nombre/apellido"""
-    df_busqueda = df.copy()
-    
-    # Convertir cédula a string para comparación
-    if 'CEDULA' in df_busqueda.columns:
-        df_busqueda['CEDULA'] = df_busqueda['CEDULA'].astype(str)
-    
+    # No se copia el DataFrame completo: con la memoria compartida eso duplicaría
+    # la matriz de notas en cada búsqueda
     if cedula:
-        # Buscar por cédula (búsqueda exacta)
-        resultado = df_busqueda[df_busqueda['CEDULA'] == str(cedula)]
+        # Buscar por cédula (búsqueda exacta). Si no hay coincidencia exacta se
+        # acepta la misma cédula sin nacionalidad en uno de los lados ('12345678'
+        # frente a 'V12345678')
+        clave = normalizar_cedula(cedula)
+        resultado = df[df['CEDULA'] == clave]
+        if resultado.empty:
+            resultado = df[df['CEDULA'].map(lambda valor: cedulas_compatibles(valor, clave))]
+        # Si la cédula corresponde a más de un estudiante (p. ej. V y E con el mismo
+        # número) no se muestra ninguno: podrían ser las notas de otra persona
+        return resultado.iloc[0] if len(resultado) == 1 else None
     elif nombres and apellidos:
         # Buscar por nombre y apellido (búsqueda parcial, insensible a mayúsculas)
-        resultado = df_busqueda[
-            (df_busqueda['NOMBRE'].str.contains(nombres, case=False, na=False)) &
-            (df_busqueda['APELLIDO'].str.contains(apellidos, case=False, na=False))
+        resultado = df[
+            (df['NOMBRE'].str.contains(nombres, case=False, na=False)) &
+            (df['APELLIDO'].str.contains(apellidos, case=False, na=False))
         ]
     else:
         return None
     
     return resultado.iloc[0] if not resultado.empty else None
 
+# Función para normalizar textos (mayúsculas y sin acentos)
+def normalizar_texto(texto):
+    texto = unicodedata.normalize('NFKD', str(texto))
+    return ''.join(c for c in texto if not unicodedata.combining(c)).upper().strip()
+
+# Función para confirmar una cédula sugerida con el apellido
+def confirmar_sugerencia(df, cedulas_sugeridas, apellido):
+    """Devuelve el estudiante si exactamente una cédula sugerida coincide con el apellido"""
+    # Se exigen apellidos completos para no confirmar con una sola letra
+    palabras = set(normalizar_texto(apellido).split())
+    if not palabras:
+        return None
+    
+    candidatos = df[df['CEDULA'].map(normalizar_cedula).isin(cedulas_sugeridas)]
+    coincidencias = candidatos[
+        candidatos['APELLIDO'].map(lambda valor: palabras <= set(normalizar_texto(valor).split()))
+    ]
+    
+    return coincidencias.iloc[0] if len(coincidencias) == 1 else None
+
 # Función para calcular estadísticas generales
 def calcular_estadisticas_generales(df):
     """Calcula estadísticas generales del curso"""
@@ -207,6 +282,43 @@ def mostrar_info_estudiante(estudiante):
     
     st.markdown("---")
 
+# Función para generar el gráfico de calificaciones (en caché por notas)
+@st.cache_data(show_spinner=False, max_entries=1000)
+def generar_grafico_calificaciones(nombres_evaluaciones, notas):
+    """Dibuja el gráfico de barras y lo devuelve como imagen PNG"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    
+    # Crear barras
+    bars = ax.bar(range(len(nombres_evaluaciones)), notas, color='skyblue', edgecolor='black')
+    
+    # Añadir línea de aprobación
+    ax.axhline(y=10, color='red', linestyle='--', alpha=0.7, label='Nota de aprobación (10)')
+    
+    # Personalizar
+    ax.set_xlabel('Evaluaciones')
+    ax.set_ylabel('Nota (0-20)')
+    ax.set_title('Calificaciones por Evaluación')
+    ax.set_xticks(range(len(nombres_evaluaciones)))
+    
+    # Acortar nombres largos para el eje X
+    nombres_cortos = [nombre[:20] + '...' if len(nombre) > 20 else nombre for nombre in nombres_evaluaciones]
+    ax.set_xticklabels(nombres_cortos, rotation=45, ha='right')
+    
+    # Añadir valores en las barras
+    for bar, nota in zip(bars, notas):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+               f'{nota:.1f}', ha='center', va='bottom', fontsize=9)
+    
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    
+    imagen = io.BytesIO()
+    fig.savefig(imagen, format="png")
+    plt.close(fig)
+    return imagen.getvalue()
+
 # Función para mostrar notas del estudiante
 def mostrar_notas_estudiante(estudiante):
     """Muestra las notas del estudiante"""
@@ -277,42 +389,42 @@ def mostrar_notas_estudiante(estudiante):
         st.markdown("---")
         st.subheader("📈 Gráfico de Calificaciones")
         
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        nombres_evaluaciones = evaluaciones_calificadas
-        notas = [estudiante[col] for col in evaluaciones_calificadas]
-        
-        # Crear barras
-        bars = ax.bar(range(len(nombres_evaluaciones)), notas, color='skyblue', edgecolor='black')
-        
-        # Añadir línea de aprobación
-        ax.axhline(y=10, color='red', linestyle='--', alpha=0.7, label='Nota de aprobación (10)')
-        
-        # Personalizar
-        ax.set_xlabel('Evaluaciones')
-        ax.set_ylabel('Nota (0-20)')
-        ax.set_title('Calificaciones por Evaluación')
-        ax.set_xticks(range(len(nombres_evaluaciones)))
-        
-        # Acortar nombres largos para el eje X
-        nombres_cortos = [nombre[:20] + '...' if len(nombre) > 20 else nombre for nombre in nombres_evaluaciones]
-        ax.set_xticklabels(nombres_cortos, rotation=45, ha='right')
+        nombres_evaluaciones = tuple(evaluaciones_calificadas)
+        notas = tuple(float(estudiante[col]) for col in evaluaciones_calificadas)
         
-        # Añadir valores en las barras
-        for bar, nota in zip(bars, notas):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                   f'{nota:.1f}', ha='center', va='bottom', fontsize=9)
-        
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
-        st.pyplot(fig)
+        st.image(generar_grafico_calificaciones(nombres_evaluaciones, notas), use_container_width=True)
+
+# Función para preparar las tablas de estadísticas (en caché, no cambian entre búsquedas)
+@st.cache_data(show_spinner=False)
+def preparar_tablas_estadisticas(estadisticas):
+    """Construye las tablas de carreras y de promedios por evaluación"""
+    df_carreras = None
+    if 'distribucion_carreras' in estadisticas:
+        df_carreras = pd.DataFrame({
+            'Carrera': list(estadisticas['distribucion_carreras'].keys()),
+            'Estudiantes': list(estadisticas['distribucion_carreras'].values())
+        })
+    
+    df_evaluaciones = None
+    if 'evaluaciones' in estadisticas and estadisticas['evaluaciones']:
+        evaluaciones_data = []
+        for eval_nombre, stats in estadisticas['evaluaciones'].items():
+            evaluaciones_data.append({
+                'Evaluación': eval_nombre[:30] + '...' if len(eval_nombre) > 30 else eval_nombre,
+                'Promedio': f"{stats['promedio']:.1f}/20",
+                'Máxima': f"{stats['maxima']:.1f}/20",
+                'Mínima': f"{stats['minima']:.1f}/20",
+                'Calificados': stats['estudiantes_calificados']
+            })
+        df_evaluaciones = pd.DataFrame(evaluaciones_data)
+    
+    return df_carreras, df_evaluaciones
 
 # Función para mostrar estadísticas generales
 def mostrar_estadisticas_generales(estadisticas):
     """Muestra estadísticas generales del curso"""
+    df_carreras, df_evaluaciones = preparar_tablas_estadisticas(estadisticas)
+    
     st.subheader("📊 Estadísticas Generales del Curso")
     
     # Información general
@@ -363,112 +475,73 @@ def mostrar_estadisticas_generales(estadisticas):
         """)
     
     # Distribución por carreras
-    if 'distribucion_carreras' in estadisticas:
+    if df_carreras is not None:
         st.markdown("---")
         st.subheader("🎓 Distribución por Carrera")
         
-        carreras = list(estadisticas['distribucion_carreras'].keys())
-        cantidades = list(estadisticas['distribucion_carreras'].values())
-        
-        # Tabla
-        df_carreras = pd.DataFrame({
-            'Carrera': carreras,
-            'Estudiantes': cantidades
-        })
         st.dataframe(df_carreras, use_container_width=True, hide_index=True)
     
     # Estadísticas por evaluación
-    if 'evaluaciones' in estadisticas and estadisticas['evaluaciones']:
+    if df_evaluaciones is not None:
         st.markdown("---")
         st.subheader("📝 Promedios por Evaluación")
         
-        evaluaciones_data = []
-        for eval_nombre, stats in estadisticas['evaluaciones'].items():
-            evaluaciones_data.append({
-                'Evaluación': eval_nombre[:30] + '...' if len(eval_nombre) > 30 else eval_nombre,
-                'Promedio': f"{stats['promedio']:.1f}/20",
-                'Máxima': f"{stats['maxima']:.1f}/20",
-                'Mínima': f"{stats['minima']:.1f}/20",
-                'Calificados': stats['estudiantes_calificados']
-            })
-        
-        df_evaluaciones = pd.DataFrame(evaluaciones_data)
         st.dataframe(df_evaluaciones, use_container_width=True, hide_index=True)
 
-# --- SECCIÓN PRINCIPAL DEL PROGRAMA ---
+# Función para calcular las estadísticas de la exportación (una sola lectura del archivo)
+@st.cache_data(show_spinner=False)
+def calcular_estadisticas_exportacion(ruta_archivo, fecha_modificacion):
+    """Recorre el archivo una vez; se recalcula solo si cambia el archivo"""
+    return calcular_estadisticas_streaming(iterar_filas(ruta_archivo))
 
-# Encabezado con información del sistema
-st.markdown("""
-<div style='background-color: #f0f2f6; padding: 15px; border-radius: 10px; margin-bottom: 20px;'>
-    <h4 style='color: #1f77b4;'>🔒 Portal de Consulta Segura de Notas</h4>
-    <p>Este sistema permite a los estudiantes consultar sus calificaciones de manera segura y privada.</p>
-    <p><strong>📁 Archivo de notas:</strong> Cargado automáticamente desde el servidor</p>
-</div>
-""", unsafe_allow_html=True)
+# Función para generar el archivo de estadísticas descargable
+@st.cache_data(show_spinner=False)
+def generar_exportacion(ruta_archivo, fecha_modificacion, formato):
+    """Genera la exportación en XLSX o CSV a partir de las estadísticas en caché"""
+    estadisticas = calcular_estadisticas_exportacion(ruta_archivo, fecha_modificacion)
+    return serializar_estadisticas(estadisticas, formato)
 
-# Sección 1: Carga automática del archivo
-st.header("📂 Estado del Sistema")
+# Función para mostrar los botones de descarga de estadísticas
+def mostrar_descarga_estadisticas(ruta_archivo):
+    """Permite descargar las estadísticas agregadas y anónimas en XLSX o CSV"""
+    # La exportación lee el archivo con openpyxl, que no admite el formato .xls antiguo
+    if not ruta_archivo or not ruta_archivo.lower().endswith('.xlsx') or not os.path.exists(ruta_archivo):
+        return
 
-# Buscar y cargar archivo automáticamente
-if st.session_state.df_notas is None:
-    with st.spinner("Buscando archivo de notas..."):
-        archivos_encontrados = buscar_y_cargar_archivo()
-        
-        if archivos_encontrados:
-            # Intentar cargar cada archivo hasta encontrar uno válido
-            for archivo in archivos_encontrados:
-                st.info(f"📂 Intentando cargar: {archivo}")
-                df, archivo_cargado = cargar_archivo(archivo)
-                
-                if df is not None:
-                    st.session_state.df_notas = df
-                    st.session_state.archivo_cargado = archivo_cargado
-                    
-                    # Calcular estadísticas generales
-                    st.session_state.estadisticas_generales = calcular_estadisticas_generales(df)
-                    
-                    st.success(f"✅ Archivo cargado exitosamente: {archivo_cargado}")
-                    st.success(f"📊 {len(df)} estudiantes encontrados en el sistema")
-                    break
-        else:
-            st.error("""
-            ❌ **No se encontró el archivo de notas**
-            
-            **Posibles soluciones:**
-            1. Asegúrate de que el archivo de notas esté en el mismo directorio que esta aplicación
-            2. El archivo debe llamarse: **notas_estudiantes.xlsx**
-            3. Contacta al administrador del sistema si el problema persiste
-            """)
-            
-            # Mostrar archivos disponibles en el directorio
-            st.info("📂 Archivos disponibles en el directorio actual:")
-            archivos_disponibles = os.listdir('.')
-            archivos_excel = [f for f in archivos_disponibles if f.endswith(('.xlsx', '.xls'))]
-            
-            if archivos_excel:
-                for archivo in archivos_excel:
-                    st.write(f"  - {archivo}")
-            else:
-                st.write("  No hay archivos Excel en el directorio")
-else:
-    st.success(f"✅ Sistema listo. Archivo cargado: {st.session_state.archivo_cargado}")
-    st.info(f"📊 {len(st.session_state.df_notas)} estudiantes en el sistema")
+    st.markdown("---")
+    st.subheader("⬇️ Descargar Estadísticas")
 
-st.markdown("---")
+    fecha_modificacion = os.path.getmtime(ruta_archivo)
+    try:
+        datos_xlsx = generar_exportacion(ruta_archivo, fecha_modificacion, 'xlsx')
+        datos_csv = generar_exportacion(ruta_archivo, fecha_modificacion, 'csv')
+    except Exception as e:
+        st.error(f"Error al generar la exportación de estadísticas: {str(e)}")
+        return
 
-# Sección 2: Búsqueda del estudiante (solo si hay datos cargados)
-if st.session_state.df_notas is not None:
-    st.header("🔍 Consultar Mis Notas")
-    
-    # Instrucciones
-    st.info("""
-    **Instrucciones:**
-    1. Ingresa tu **cédula** exactamente como aparece en el sistema
-    2. O ingresa tu **nombre y apellido** (puedes usar solo una parte si lo prefieres)
-    3. Haz clic en "Buscar mis notas"
-    4. Solo podrás ver **tus propias calificaciones**
-    """)
-    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "📊 Descargar en Excel",
+            data=datos_xlsx,
+            file_name="estadisticas_curso.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True
+        )
+    with col2:
+        st.download_button(
+            "📄 Descargar en CSV",
+            data=datos_csv,
+            file_name="estadisticas_curso.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
+# Sección de búsqueda y resultados como fragmento: al escribir, cambiar el método
+# o pulsar un botón solo se vuelve a ejecutar esta función, no la página completa
+@st.fragment
+def seccion_consulta():
+    """Muestra el formulario de búsqueda y el resultado de la consulta"""
     # Opciones de búsqueda
     metodo_busqueda = st.radio(
         "Método de búsqueda:",
@@ -496,11 +569,19 @@ if st.session_state.df_notas is not None:
                             cedula=cedula
                         )
                         
+                        st.session_state.cedulas_sugeridas = None
                         if estudiante is not None:
                             st.session_state.estudiante_encontrado = estudiante
                             st.success("✅ ¡Estudiante encontrado!")
                         else:
                             st.error("❌ No se encontró ningún estudiante con esa cédula.")
+                            
+                            # Buscar cédulas parecidas (errores de tipeo de 1-2 dígitos)
+                            if st.session_state.indice_cedulas is not None:
+                                sugeridas = st.session_state.indice_cedulas.sugerencias(cedula)
+                                if sugeridas:
+                                    st.session_state.cedulas_sugeridas = (cedula, sugeridas)
+                            
                             st.info("""
                             **Sugerencias:**
                             - Verifica que hayas ingresado correctamente tu cédula
@@ -512,8 +593,43 @@ if st.session_state.df_notas is not None:
         
         with col2:
             if st.button("🔄 Limpiar búsqueda", use_container_width=True):
+                # El panel de resultados se dibuja más abajo en este mismo fragmento,
+                # así que no hace falta forzar otro rerun
                 st.session_state.estudiante_encontrado = None
-                st.rerun()
+                st.session_state.cedulas_sugeridas = None
+        
+        # Confirmación de una cédula parecida: nunca se muestra la cédula ni los datos
+        # sugeridos, el estudiante debe confirmar con su apellido
+        if st.session_state.cedulas_sugeridas is not None and st.session_state.cedulas_sugeridas[0] == cedula:
+            st.warning("""
+            🤔 **¿Te equivocaste al escribir la cédula?**
+            Hay una cédula registrada muy parecida a la que escribiste. Si crees que es la tuya,
+            confirma tu identidad escribiendo uno de tus apellidos.
+            """)
+            
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                apellido_confirmacion = st.text_input(
+                    "Apellido para confirmar:",
+                    placeholder="Ej: ACOSTA",
+                    label_visibility="collapsed"
+                )
+            with col2:
+                confirmar = st.button("✅ Confirmar", use_container_width=True)
+            
+            if confirmar:
+                estudiante = confirmar_sugerencia(
+                    st.session_state.df_notas,
+                    st.session_state.cedulas_sugeridas[1],
+                    apellido_confirmacion
+                )
+                
+                if estudiante is not None:
+                    st.session_state.estudiante_encontrado = estudiante
+                    st.session_state.cedulas_sugeridas = None
+                    st.success("✅ ¡Estudiante encontrado!")
+                else:
+                    st.error("❌ No pudimos confirmar tu identidad. Verifica tu cédula o busca por nombre y apellido.")
     
     else:  # Por nombre y apellido
         col1, col2 = st.columns(2)
@@ -564,8 +680,9 @@ if st.session_state.df_notas is not None:
         
         with col2:
             if st.button("🔄 Limpiar búsqueda", use_container_width=True):
+                # El panel de resultados se dibuja más abajo en este mismo fragmento,
+                # así que no hace falta forzar otro rerun
                 st.session_state.estudiante_encontrado = None
-                st.rerun()
     
     st.markdown("---")
     
@@ -593,6 +710,7 @@ if st.session_state.df_notas is not None:
         
         if st.session_state.estadisticas_generales:
             mostrar_estadisticas_generales(st.session_state.estadisticas_generales)
+            mostrar_descarga_estadisticas(st.session_state.archivo_cargado)
     
     else:
         # Mensaje inicial si no se ha buscado
@@ -650,6 +768,91 @@ if st.session_state.df_notas is not None:
             - **Notas incorrectas**: Reporta cualquier discrepancia al profesor
             """)
 
+# --- SECCIÓN PRINCIPAL DEL PROGRAMA ---
+
+# Encabezado con información del sistema
+st.markdown("""
+<div style='background-color: #f0f2f6; padding: 15px; border-radius: 10px; margin-bottom: 20px;'>
+    <h4 style='color: #1f77b4;'>🔒 Portal de Consulta Segura de Notas</h4>
+    <p>Este sistema permite a los estudiantes consultar sus calificaciones de manera segura y privada.</p>
+    <p><strong>📁 Archivo de notas:</strong> Cargado automáticamente desde el servidor</p>
+</div>
+""", unsafe_allow_html=True)
+
+# Sección 1: Carga automática del archivo
+st.header("📂 Estado del Sistema")
+
+# Buscar y cargar archivo automáticamente
+if st.session_state.df_notas is None:
+    with st.spinner("Buscando archivo de notas..."):
+        archivos_encontrados = buscar_y_cargar_archivo()
+        
+        if archivos_encontrados:
+            # Intentar cargar cada archivo hasta encontrar uno válido
+            for archivo in archivos_encontrados:
+                st.info(f"📂 Intentando cargar: {archivo}")
+                fecha_modificacion = os.path.getmtime(archivo)
+                if USAR_MEMORIA_COMPARTIDA:
+                    df, archivo_cargado = cargar_archivo_compartido(archivo)
+                else:
+                    df, archivo_cargado = cargar_archivo(archivo)
+                
+                if df is not None:
+                    st.session_state.df_notas = df
+                    st.session_state.archivo_cargado = archivo_cargado
+                    
+                    # Calcular estadísticas generales
+                    st.session_state.estadisticas_generales = calcular_estadisticas_generales(df)
+                    
+                    # Índice de cédulas para sugerir correcciones de tipeo
+                    st.session_state.indice_cedulas = construir_indice_cedulas(
+                        os.path.abspath(archivo_cargado), fecha_modificacion, df['CEDULA']
+                    )
+                    
+                    st.success(f"✅ Archivo cargado exitosamente: {archivo_cargado}")
+                    st.success(f"📊 {len(df)} estudiantes encontrados en el sistema")
+                    break
+        else:
+            st.error("""
+            ❌ **No se encontró el archivo de notas**
+            
+            **Posibles soluciones:**
+            1. Asegúrate de que el archivo de notas esté en el mismo directorio que esta aplicación
+            2. El archivo debe llamarse: **notas_estudiantes.xlsx**
+            3. Contacta al administrador del sistema si el problema persiste
+            """)
+            
+            # Mostrar archivos disponibles en el directorio
+            st.info("📂 Archivos disponibles en el directorio actual:")
+            archivos_disponibles = os.listdir('.')
+            archivos_excel = [f for f in archivos_disponibles if f.endswith(('.xlsx', '.xls'))]
+            
+            if archivos_excel:
+                for archivo in archivos_excel:
+                    st.write(f"  - {archivo}")
+            else:
+                st.write("  No hay archivos Excel en el directorio")
+else:
+    st.success(f"✅ Sistema listo. Archivo cargado: {st.session_state.archivo_cargado}")
+    st.info(f"📊 {len(st.session_state.df_notas)} estudiantes en el sistema")
+
+st.markdown("---")
+
+# Sección 2: Búsqueda del estudiante (solo si hay datos cargados)
+if st.session_state.df_notas is not None:
+    st.header("🔍 Consultar Mis Notas")
+    
+    # Instrucciones
+    st.info("""
+    **Instrucciones:**
+    1. Ingresa tu **cédula** exactamente como aparece en el sistema
+    2. O ingresa tu **nombre y apellido** (puedes usar solo una parte si lo prefieres)
+    3. Haz clic en "Buscar mis notas"
+    4. Solo podrás ver **tus propias calificaciones**
+    """)
+    
+    seccion_consulta()
+
 # Sección de información si no hay datos cargados
 else:
     st.info("👋 **Bienvenido al Portal de Notas Estudiantiles**")
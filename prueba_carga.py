@@ -0,0 +1,271 @@
+"""
+Prueba de carga del Portal de Notas Estudiantiles.
+
+Ejecuta `portal_estudiante.py` sin navegador (con AppTest de Streamlit) y simula
+N sesiones concurrentes que hacen búsquedas por cédula, búsquedas por nombre y
+reinicios con "Limpiar búsqueda" sobre una lista sintética de estudiantes.
+Al final reporta percentiles de latencia por rerun, rendimiento (reruns/s) y
+crecimiento de memoria (RSS) por sesión.
+
+Cada sesión corre en su propio proceso: AppTest.run() instala y luego borra el
+Runtime global de Streamlit, así que dos AppTest en hilos del mismo proceso se
+rompen entre sí.
+
+Uso:
+    python prueba_carga.py --sesiones 20 --acciones 15 --estudiantes 2000
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+# Configuración de la prueba
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "portal_estudiante.py")
+ARCHIVO_SINTETICO = "notas_estudiantes.xlsx"  # Mismo nombre que busca el portal
+CARRERAS = ["FISICA", "BIOLOGIA", "QUIMICA", "MATEMATICA", "COMPUTACION"]
+NOMBRES = ["FÉLIX", "MARÍA", "JOSÉ", "ANA", "LUIS", "CARMEN", "PEDRO", "SOFÍA", "JUAN", "VALERIA"]
+APELLIDOS = ["ACOSTA", "ANDRADE", "BRICEÑO", "CASTILLO", "DÍAZ", "FERNÁNDEZ", "GÓMEZ", "PÉREZ", "RÍOS", "TORRES"]
+EVALUACIONES = ["Parcial I", "Quiz 1 (2.5%)", "Quiz 2 (2.5%)", "Quiz 3 (2.5%)", "Quiz 4 (2.5%)",
+                "Parcial 2 (15.0%)", "Parcial 3 (15%)", "Parcial 4 (15%)", "quiz 5", "quiz 6", "final"]
+
+ETIQUETA_RADIO = "Método de búsqueda:"
+OPCION_CEDULA = "🆔 Por número de cédula"
+OPCION_NOMBRE = "👤 Por nombre y apellido"
+BOTON_BUSCAR = "🔍 Buscar mis notas"
+BOTON_LIMPIAR = "🔄 Limpiar búsqueda"
+
+# Función para generar una lista sintética de estudiantes
+def generar_lista_sintetica(ruta_archivo, n_estudiantes, semilla=0):
+    """Genera un archivo Excel con el mismo formato que el archivo real del profesor"""
+    rng = np.random.default_rng(semilla)
+
+    cedulas = rng.choice(np.arange(10_000_000, 35_000_000), size=n_estudiantes, replace=False)
+    datos = {
+        'LICENCIATURA': rng.choice(CARRERAS, size=n_estudiantes),
+        'CÉDULA': cedulas,
+        'NOMBRES': [f"{a} {b}" for a, b in zip(rng.choice(NOMBRES, n_estudiantes), rng.choice(NOMBRES, n_estudiantes))],
+        'APELLIDOS': [f"{a} {b}" for a, b in zip(rng.choice(APELLIDOS, n_estudiantes), rng.choice(APELLIDOS, n_estudiantes))],
+        'CORREO': [f"estudiante{c}@correo.com" for c in cedulas],
+    }
+
+    for evaluacion in EVALUACIONES:
+        notas = np.round(rng.uniform(0, 20, n_estudiantes) * 2) / 2
+        # Aproximadamente un 15% de evaluaciones sin calificar
+        notas[rng.random(n_estudiantes) < 0.15] = np.nan
+        datos[evaluacion] = notas
+
+    df = pd.DataFrame(datos)
+    df['NOTA FINAL'] = df[EVALUACIONES].mean(axis=1)
+    df['PROGRESO (%)'] = df[EVALUACIONES].notna().mean(axis=1) * 100
+    df.to_excel(ruta_archivo, index=False)
+
+    return df[['CÉDULA', 'NOMBRES', 'APELLIDOS']].astype(str).values.tolist()
+
+# Función para obtener la memoria residente actual del proceso (en MB)
+def memoria_rss_mb():
+    """Devuelve el RSS actual del proceso en MB"""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas_residentes = int(f.read().split()[1])
+        return paginas_residentes * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        # En sistemas sin /proc se usa el pico de memoria como aproximación
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+# Funciones auxiliares para ubicar widgets por su etiqueta
+def _widget(lista, etiqueta):
+    for widget in lista:
+        if widget.label == etiqueta:
+            return widget
+    raise LookupError(f"No se encontró el widget '{etiqueta}'")
+
+def _ejecutar(at, latencias, timeout):
+    """Ejecuta un rerun de la sesión y registra su latencia"""
+    inicio = time.perf_counter()
+    at.run(timeout=timeout)
+    latencias.append(time.perf_counter() - inicio)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+# Acciones simuladas de un estudiante
+def accion_buscar_cedula(at, estudiante, latencias, timeout):
+    _widget(at.radio, ETIQUETA_RADIO).set_value(OPCION_CEDULA)
+    _ejecutar(at, latencias, timeout)
+    at.text_input[0].set_value(estudiante[0])
+    _widget(at.button, BOTON_BUSCAR).click()
+    _ejecutar(at, latencias, timeout)
+
+def accion_buscar_nombre(at, estudiante, latencias, timeout):
+    _widget(at.radio, ETIQUETA_RADIO).set_value(OPCION_NOMBRE)
+    _ejecutar(at, latencias, timeout)
+    # Los estudiantes suelen escribir solo su primer nombre y apellido
+    at.text_input[0].set_value(estudiante[1].split()[0])
+    at.text_input[1].set_value(estudiante[2].split()[0])
+    _widget(at.button, BOTON_BUSCAR).click()
+    _ejecutar(at, latencias, timeout)
+
+def accion_limpiar(at, estudiante, latencias, timeout):
+    _widget(at.button, BOTON_LIMPIAR).click()
+    _ejecutar(at, latencias, timeout)
+
+ACCIONES = [accion_buscar_cedula, accion_buscar_nombre, accion_limpiar]
+
+# Función que simula una sesión completa de un estudiante (en su propio proceso)
+def simular_sesion(id_sesion, directorio, estudiantes, n_acciones, timeout, barrera, cola):
+    """Calienta el proceso, espera a las demás sesiones y ejecuta acciones aleatorias"""
+    rng = random.Random(id_sesion)
+    latencias = []
+    errores = []
+    rss_inicial = memoria_rss_mb()
+
+    try:
+        # El portal busca el archivo de notas en el directorio de trabajo
+        os.chdir(directorio)
+        # Calentamiento: importa módulos y llena las cachés del proceso, como en un
+        # servidor que ya atendió a otro estudiante
+        AppTest.from_file(RUTA_APP, default_timeout=timeout).run()
+        at = AppTest.from_file(RUTA_APP, default_timeout=timeout)
+        rss_inicial = memoria_rss_mb()
+        barrera.wait()
+        # Primera carga de la página de una sesión nueva
+        _ejecutar(at, latencias, timeout)
+
+        for _ in range(n_acciones):
+            accion = rng.choice(ACCIONES)
+            estudiante = rng.choice(estudiantes)
+            try:
+                accion(at, estudiante, latencias, timeout)
+            except Exception as e:
+                errores.append(f"{accion.__name__}: {e}")
+    except Exception as e:
+        # Si la sesión falla antes de la barrera, se rompe para no dejar esperando a las demás
+        barrera.abort()
+        errores.append(f"sesión {id_sesion}: {e!r}")
+
+    rss_final = memoria_rss_mb()
+    cola.put((id_sesion, latencias, errores, rss_inicial, rss_final))
+
+# Función principal de la prueba de carga
+def ejecutar_prueba(n_sesiones, n_acciones, n_estudiantes, semilla=0, timeout=60):
+    """Ejecuta la prueba de carga y devuelve un diccionario con los resultados"""
+    # 'spawn' para que cada proceso arranque limpio, sin hilos ni estado de Streamlit heredados
+    contexto = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        estudiantes = generar_lista_sintetica(
+            os.path.join(directorio, ARCHIVO_SINTETICO), n_estudiantes, semilla
+        )
+
+        resultados = {}
+        barrera = contexto.Barrier(n_sesiones + 1)
+        cola = contexto.Queue()
+        procesos = [
+            contexto.Process(
+                target=simular_sesion,
+                args=(i, directorio, estudiantes, n_acciones, timeout, barrera, cola),
+                daemon=True
+            )
+            for i in range(n_sesiones)
+        ]
+        for proceso in procesos:
+            proceso.start()
+
+        try:
+            # Si un proceso muere sin llegar a la barrera, se deja de esperar tras el timeout
+            barrera.wait(timeout=timeout)
+        except threading.BrokenBarrierError:
+            pass  # Alguna sesión no pudo iniciar; el error queda en su resultado
+        inicio = time.perf_counter()
+
+        # Los resultados se leen antes de join(): un proceso no termina hasta que
+        # se consume lo que puso en la cola
+        while len(resultados) < n_sesiones:
+            try:
+                id_sesion, *resultado = cola.get(timeout=1)
+                resultados[id_sesion] = resultado
+            except queue.Empty:
+                if not any(proceso.is_alive() for proceso in procesos):
+                    break
+        duracion = time.perf_counter() - inicio
+        for proceso in procesos:
+            proceso.join()
+
+    # Memoria promedio de los procesos que entregaron resultados
+    rss_inicial = np.mean([r[2] for r in resultados.values()]) if resultados else 0.0
+    rss_final = np.mean([r[3] for r in resultados.values()]) if resultados else 0.0
+
+    for i, proceso in enumerate(procesos):
+        if i not in resultados:
+            resultados[i] = ([], [f"sesión {i}: el proceso terminó sin resultados (código {proceso.exitcode})"])
+    latencias = np.array([l for lats, *_ in resultados.values() for l in lats]) * 1000
+    errores = [e for _, errs, *_ in resultados.values() for e in errs]
+
+    resumen = {
+        'sesiones': n_sesiones,
+        'estudiantes': n_estudiantes,
+        'reruns': len(latencias),
+        'errores': errores,
+        'duracion_s': duracion,
+        'reruns_por_segundo': len(latencias) / duracion if duracion > 0 else 0,
+        'rss_inicial_mb': rss_inicial,
+        'rss_final_mb': rss_final,
+        'rss_por_sesion_mb': rss_final - rss_inicial,
+    }
+    if len(latencias) > 0:
+        for p in (50, 90, 95, 99):
+            resumen[f'p{p}_ms'] = np.percentile(latencias, p)
+        resumen['max_ms'] = latencias.max()
+
+    return resumen
+
+# Función para mostrar el reporte de resultados
+def mostrar_reporte(resumen):
+    print("=" * 60)
+    print("📊 Prueba de carga - Portal de Notas Estudiantiles")
+    print("=" * 60)
+    print(f"Sesiones concurrentes:   {resumen['sesiones']}")
+    print(f"Estudiantes en la lista: {resumen['estudiantes']}")
+    print(f"Reruns ejecutados:       {resumen['reruns']}")
+    print(f"Duración total:          {resumen['duracion_s']:.2f} s")
+    print(f"Rendimiento:             {resumen['reruns_por_segundo']:.1f} reruns/s")
+    print("-" * 60)
+    if 'p50_ms' in resumen:
+        print("Latencia por rerun:")
+        for p in (50, 90, 95, 99):
+            print(f"  p{p}: {resumen[f'p{p}_ms']:8.1f} ms")
+        print(f"  máx: {resumen['max_ms']:8.1f} ms")
+    print("-" * 60)
+    print(f"RSS inicial por proceso: {resumen['rss_inicial_mb']:.1f} MB")
+    print(f"RSS final por proceso:   {resumen['rss_final_mb']:.1f} MB")
+    print(f"Crecimiento por sesión:  {resumen['rss_por_sesion_mb']:.2f} MB")
+    if resumen['errores']:
+        print("-" * 60)
+        print(f"⚠️ {len(resumen['errores'])} errores durante la prueba:")
+        for error in resumen['errores'][:10]:
+            print(f"  - {error}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga del Portal de Notas Estudiantiles")
+    parser.add_argument("--sesiones", type=int, default=10, help="Número de sesiones concurrentes")
+    parser.add_argument("--acciones", type=int, default=10, help="Acciones por sesión")
+    parser.add_argument("--estudiantes", type=int, default=500, help="Tamaño de la lista sintética")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla para los datos sintéticos")
+    parser.add_argument("--timeout", type=float, default=60, help="Tiempo máximo por rerun (s)")
+    args = parser.parse_args()
+
+    resumen = ejecutar_prueba(args.sesiones, args.acciones, args.estudiantes, args.semilla, args.timeout)
+    mostrar_reporte(resumen)
+    sys.exit(1 if resumen['errores'] else 0)
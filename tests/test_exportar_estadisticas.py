@@ -0,0 +1,141 @@
+import csv
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from streamlit.testing.v1 import AppTest
+
+from exportar_estadisticas import (
+    _a_numero,
+    _mediana,
+    _rango_nota,
+    calcular_estadisticas_streaming,
+    iterar_archivos,
+    iterar_filas,
+    serializar_estadisticas,
+)
+from prueba_carga import generar_lista_sintetica
+
+RUTA_PORTAL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "portal_estudiante.py")
+
+
+def _lista(ruta, n_estudiantes=200, semilla=0):
+    """Lista sintética con columna de estado y una nota de texto ('NP')"""
+    generar_lista_sintetica(ruta, n_estudiantes, semilla)
+    df = pd.read_excel(ruta)
+    df['ESTADO'] = np.where(np.arange(len(df)) % 7 == 0, 'Retirado', 'Activo')
+    df['Parcial I'] = df['Parcial I'].astype(object)
+    df.loc[3, 'Parcial I'] = 'NP'
+    df.to_excel(ruta, index=False)
+    return df
+
+
+def test_a_numero():
+    assert _a_numero(15) == 15.0
+    assert _a_numero(' 15,5 ') == 15.5
+    assert _a_numero('NP') is None
+    assert _a_numero(None) is None
+    assert _a_numero(True) is None
+    assert _a_numero(float('nan')) is None
+
+
+def test_rango_nota_limita_a_los_extremos():
+    assert _rango_nota(0) == 0
+    assert _rango_nota(9.99) == 9
+    assert _rango_nota(10) == 10
+    assert _rango_nota(20) == 19
+    assert _rango_nota(-1) == 0
+    assert _rango_nota(25) == 19
+
+
+@pytest.mark.parametrize("notas", [[5.0], [5.0, 7.0], [3.0, 1.0, 2.0], [4.0, 4.0, 4.0, 9.5], [1.0, 2.0, 2.0, 2.0, 8.0, 9.0]])
+def test_mediana_desde_frecuencias(notas):
+    frecuencias = pd.Series(notas).value_counts().to_dict()
+    assert _mediana(frecuencias, len(notas)) == np.median(notas)
+
+
+def test_coincide_con_el_portal(tmp_path, monkeypatch):
+    ruta = tmp_path / "notas_estudiantes.xlsx"
+    _lista(str(ruta))
+
+    monkeypatch.chdir(tmp_path)
+    at = AppTest.from_file(RUTA_PORTAL, default_timeout=60).run()
+    assert not at.exception
+    esperadas = at.session_state['estadisticas_generales']
+
+    obtenidas = calcular_estadisticas_streaming(iterar_filas(str(ruta)))
+
+    for clave in ('total_estudiantes', 'estudiantes_activos', 'estudiantes_retirados', 'aprobados'):
+        assert obtenidas[clave] == esperadas[clave]
+    for clave in ('nota_promedio', 'nota_maxima', 'nota_minima', 'porcentaje_aprobados'):
+        assert obtenidas[clave] == pytest.approx(esperadas[clave])
+    assert abs(obtenidas['nota_mediana'] - esperadas['nota_mediana']) <= 0.005
+    assert obtenidas['distribucion_carreras'] == esperadas['distribucion_carreras']
+
+    assert obtenidas['evaluaciones'].keys() == esperadas['evaluaciones'].keys()
+    for columna, stats in esperadas['evaluaciones'].items():
+        for clave, valor in stats.items():
+            assert obtenidas['evaluaciones'][columna][clave] == pytest.approx(valor)
+
+
+def test_varios_archivos_equivalen_a_uno(tmp_path):
+    df_a = _lista(str(tmp_path / "a.xlsx"), 50, semilla=1)
+    df_b = _lista(str(tmp_path / "b.xlsx"), 70, semilla=2)
+    pd.concat([df_a, df_b]).to_excel(tmp_path / "ab.xlsx", index=False)
+
+    separadas = calcular_estadisticas_streaming(iterar_archivos([str(tmp_path / "a.xlsx"), str(tmp_path / "b.xlsx")]))
+    juntas = calcular_estadisticas_streaming(iterar_filas(str(tmp_path / "ab.xlsx")))
+
+    assert separadas['total_estudiantes'] == 120
+    assert separadas.keys() == juntas.keys()
+    assert separadas['distribucion'] == juntas['distribucion']
+    assert separadas['distribucion_carreras'] == juntas['distribucion_carreras']
+    assert separadas['nota_mediana'] == juntas['nota_mediana']
+    assert separadas['nota_promedio'] == pytest.approx(juntas['nota_promedio'])
+
+
+def _estadisticas():
+    filas = [
+        {'CEDULA': '1', 'CARRERA': 'QUIMICA', 'ESTADO': 'Activo', 'Parcial I': 15, 'NOTA FINAL': 15},
+        {'CEDULA': '2', 'CARRERA': 'QUIMICA', 'ESTADO': 'Activo', 'Parcial I': 'NP', 'NOTA FINAL': 8},
+        {'CEDULA': '3', 'CARRERA': 'FISICA', 'ESTADO': 'Retirado', 'Parcial I': 20, 'NOTA FINAL': None},
+    ]
+    return calcular_estadisticas_streaming(filas)
+
+
+def test_exportacion_xlsx(tmp_path):
+    estadisticas = _estadisticas()
+    libro = load_workbook(io.BytesIO(serializar_estadisticas(estadisticas, 'xlsx')))
+
+    assert libro.sheetnames == ['Resumen', 'Carreras', 'Evaluaciones', 'Distribución']
+    resumen = dict(libro['Resumen'].iter_rows(min_row=2, values_only=True))
+    assert resumen['Total de estudiantes'] == 3
+    assert resumen['Mediana (aprox. ±0.005)'] == 11.5
+    assert list(libro['Carreras'].iter_rows(values_only=True)) == [('Carrera', 'Estudiantes'), ('QUIMICA', 2), ('FISICA', 1)]
+    evaluacion = list(libro['Evaluaciones'].iter_rows(min_row=2, values_only=True))
+    assert evaluacion == [('Parcial I', 17.5, 20, 15, 2, 2, 100.0)]
+    histograma = list(libro['Distribución'].iter_rows(min_row=2, values_only=True))[0]
+    assert histograma[0] == 'Parcial I'
+    assert histograma[16] == 1 and histograma[20] == 1 and sum(histograma[1:]) == 2
+
+
+def test_exportacion_csv():
+    datos = serializar_estadisticas(_estadisticas(), 'csv').decode('utf-8-sig')
+    filas = list(csv.reader(io.StringIO(datos)))
+
+    assert filas[0] == ['tabla', 'clave', 'metrica', 'valor']
+    assert ['Resumen', '', 'Total de estudiantes', '3'] in filas
+    assert ['Carreras', 'QUIMICA', 'Estudiantes', '2'] in filas
+    assert ['Carreras', 'FISICA', 'Estudiantes', '1'] in filas
+    assert ['Evaluaciones', 'Parcial I', 'Promedio', '17.5'] in filas
+    assert ['Distribución', 'Parcial I', '19-20', '1'] in filas
+
+
+def test_archivo_no_xlsx(tmp_path):
+    ruta = tmp_path / "notas.xls"
+    ruta.write_bytes(b"\xd0\xcf\x11\xe0 no es un zip")
+    with pytest.raises(ValueError, match="no es un Excel .xlsx"):
+        list(iterar_filas(str(ruta)))
@@ -0,0 +1,144 @@
+import os
+import random
+
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from indice_cedulas import IndiceCedulas, cedulas_compatibles, distancia_acotada, normalizar_cedula
+
+RUTA_PORTAL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "portal_estudiante.py")
+
+
+def _distancia_fuerza_bruta(a, b):
+    """Distancia con transposición de vecinos calculada con la matriz completa"""
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+@pytest.mark.parametrize("entrada, esperado", [
+    ("12345678", "12345678"),
+    (12345678, "12345678"),
+    ("12345678.0", "12345678"),
+    (12345678.0, "12345678"),
+    ("V-12.345.678", "V12345678"),
+    (" e 12 345 678 ", "E12345678"),
+    ("v12345678", "V12345678"),
+    (None, ""),
+])
+def test_normalizar_cedula(entrada, esperado):
+    assert normalizar_cedula(entrada) == esperado
+
+
+def test_cedulas_compatibles():
+    assert cedulas_compatibles("V12345678", "V12345678")
+    assert cedulas_compatibles("12345678", "V12345678")
+    assert cedulas_compatibles("E12345678", "12345678")
+    assert not cedulas_compatibles("V12345678", "E12345678")
+    assert not cedulas_compatibles("12345678", "12345679")
+
+
+@pytest.mark.parametrize("a, b, esperado", [
+    ("12345678", "12345678", 0),
+    ("12345678", "12345679", 1),   # sustitución
+    ("12345678", "12435678", 1),   # transposición de vecinos
+    ("12345678", "1234567", 1),    # dígito faltante
+    ("12345678", "123456789", 1),  # dígito sobrante
+    ("12345678", "92345679", 2),
+    ("12345678", "21435678", 2),   # dos transposiciones
+])
+def test_distancia_acotada(a, b, esperado):
+    assert distancia_acotada(a, b, 2) == esperado
+    assert distancia_acotada(b, a, 2) == esperado
+
+
+def test_distancia_acotada_corta_por_encima_del_limite():
+    assert distancia_acotada("12345678", "87654321", 2) == 3
+    assert distancia_acotada("12345678", "123456", 1) == 2
+
+
+def test_sugerencias_transposicion():
+    indice = IndiceCedulas(["32778512", "32672049", "30111222"])
+    assert indice.sugerencias("32775812") == ["32778512"]
+
+
+def test_sugerencias_prefiere_la_menor_distancia():
+    indice = IndiceCedulas(["12345678", "12345699"])
+    assert indice.sugerencias("12345679") == ["12345678", "12345699"]
+    assert indice.sugerencias("12345670") == ["12345678"]
+
+
+def test_sugerencias_sin_coincidencias():
+    indice = IndiceCedulas(["12345678"])
+    assert indice.sugerencias("87654321") == []
+    assert indice.sugerencias("") == []
+
+
+def test_coincidencia_normalizada_es_la_propia_cedula():
+    indice = IndiceCedulas(["12345678.0", "V-23456789"])
+    assert indice.sugerencias("12345678") == ["12345678"]
+    assert indice.sugerencias("V-23.456.789") == ["V23456789"]
+
+
+def test_nacionalidad_distingue_cedulas():
+    indice = IndiceCedulas(["V-12345678", "E-12345678"])
+    assert len(indice) == 2
+    assert indice.sugerencias("V-12345678") == ["V12345678"]
+    # Sin nacionalidad no se sabe cuál es: se sugieren ambas
+    assert indice.sugerencias("12345678") == ["E12345678", "V12345678"]
+    assert indice.buscar("E-12345679") == [(1, "E12345678"), (2, "V12345678")]
+
+
+def test_cedulas_repetidas_se_indexan_una_vez():
+    indice = IndiceCedulas(["12345678", "12345678.0", " 12.345.678 "])
+    assert len(indice) == 1
+
+
+def test_portal_no_confunde_cedulas_v_y_e(tmp_path, monkeypatch):
+    pd.DataFrame({
+        'CÉDULA': ['V-12345678', 'E-12345678', '23456789'],
+        'NOMBRES': ['ANA', 'LUIS', 'JOSÉ'],
+        'APELLIDOS': ['PÉREZ', 'GÓMEZ', 'RÍOS'],
+        'Parcial I': [15.0, 8.0, 12.0],
+    }).to_excel(tmp_path / "notas_estudiantes.xlsx", index=False)
+    monkeypatch.chdir(tmp_path)
+    at = AppTest.from_file(RUTA_PORTAL, default_timeout=60).run()
+
+    def buscar(cedula):
+        at.text_input[0].set_value(cedula)
+        next(b for b in at.button if b.label == "🔍 Buscar mis notas").click()
+        at.run()
+        encontrado = at.session_state['estudiante_encontrado']
+        at.session_state['estudiante_encontrado'] = None
+        return None if encontrado is None else encontrado['APELLIDO']
+
+    assert buscar("E-12.345.678") == "GÓMEZ"
+    assert buscar("v12345678") == "PÉREZ"
+    assert buscar("12345678") is None  # ambigua: no se muestra ninguna
+    assert buscar("V23456789") == "RÍOS"
+
+
+def test_buscar_coincide_con_fuerza_bruta():
+    rng = random.Random(0)
+    cedulas = [str(c) for c in rng.sample(range(1_000_000, 35_000_000), 500)]
+    indice = IndiceCedulas(cedulas)
+
+    for cedula in rng.sample(cedulas, 50):
+        digitos = list(cedula)
+        i = rng.randrange(len(digitos) - 1)
+        digitos[i], digitos[i + 1] = digitos[i + 1], digitos[i]
+        if rng.random() < 0.5:
+            digitos[rng.randrange(len(digitos))] = str(rng.randrange(10))
+        consulta = "".join(digitos)
+
+        esperado = sorted(c for c in cedulas if _distancia_fuerza_bruta(consulta, c) <= 2)
+        assert sorted(c for _, c in indice.buscar(consulta, 2)) == esperado
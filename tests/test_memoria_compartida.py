@@ -0,0 +1,102 @@
+import os
+import stat
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import memoria_compartida
+
+
+@pytest.fixture
+def directorio(tmp_path, monkeypatch):
+    monkeypatch.setattr(memoria_compartida, "DIRECTORIO_COMPARTIDO", str(tmp_path))
+    monkeypatch.delenv("PORTAL_SEGMENTO_NOTAS", raising=False)
+    return tmp_path
+
+
+def _notas(tmp_path, nombre="notas.xlsx"):
+    origen = tmp_path / nombre
+    origen.write_bytes(b"x")  # solo se usan su ruta y su fecha de modificación
+    df = pd.DataFrame({
+        'CARRERA': ['FISICA', None],
+        'CEDULA': ['12345678', '23456789'],
+        'NOMBRE': ['FÉLIX', 'ANA'],
+        'Parcial I': pd.Series([15.0, 'NP'], dtype=object),
+        'Quiz 1': [18, 0],
+        'NOTA FINAL': [15.4125, np.nan],
+    })
+    return df, str(origen)
+
+
+def test_publicar_y_adjuntar(directorio):
+    df, origen = _notas(directorio)
+    ruta = memoria_compartida.publicar_notas(df, origen, os.path.getmtime(origen))
+    segmento = memoria_compartida.SegmentoNotas(ruta)
+    adjunto = memoria_compartida.adjuntar_notas(segmento)
+
+    assert list(adjunto.columns) == list(df.columns)
+    assert adjunto['CEDULA'].tolist() == ['12345678', '23456789']
+    assert pd.isna(adjunto.loc[1, 'CARRERA'])
+    # Columna mixta: la nota queda como número y el texto como NaN
+    assert adjunto.loc[0, 'Parcial I'] == 15.0
+    assert np.isnan(adjunto.loc[1, 'Parcial I'])
+    assert adjunto['NOTA FINAL'].dtype == np.float32
+    assert memoria_compartida.cabecera_vigente(segmento.cabecera, origen)
+
+
+def test_bloque_numerico_sin_copia(directorio):
+    df, origen = _notas(directorio)
+    segmento = memoria_compartida.SegmentoNotas(memoria_compartida.publicar_notas(df, origen, os.path.getmtime(origen)))
+    adjunto = memoria_compartida.adjuntar_notas(segmento)
+    assert np.shares_memory(adjunto['Quiz 1'].to_numpy(), segmento.mapa)
+
+
+def test_columnas_de_identidad_sin_copia(directorio):
+    df, origen = _notas(directorio)
+    segmento = memoria_compartida.SegmentoNotas(memoria_compartida.publicar_notas(df, origen, os.path.getmtime(origen)))
+    adjunto = memoria_compartida.adjuntar_notas(segmento)
+
+    inicio = segmento.mapa.ctypes.data
+    fin = inicio + segmento.mapa.nbytes
+    for col in ('CARRERA', 'CEDULA', 'NOMBRE'):
+        for buffer in adjunto[col].array.__arrow_array__().chunk(0).buffers():
+            assert buffer is None or inicio <= buffer.address < fin
+    # Las búsquedas del portal funcionan sobre las vistas
+    assert adjunto['NOMBRE'].str.contains('félix', case=False).tolist() == [True, False]
+    assert (adjunto['CEDULA'] == '23456789').tolist() == [False, True]
+
+
+def test_version_modificada_durante_la_lectura_no_es_vigente(directorio):
+    df, origen = _notas(directorio)
+    # La fecha se tomó antes de leer; el profesor guardó el archivo después
+    leida = os.path.getmtime(origen)
+    os.utime(origen, (leida + 5, leida + 5))
+    ruta = memoria_compartida.publicar_notas(df, origen, leida)
+    assert not memoria_compartida.cabecera_vigente(memoria_compartida.SegmentoNotas(ruta).cabecera, origen)
+
+
+def test_archivo_solo_para_el_usuario(directorio):
+    df, origen = _notas(directorio)
+    ruta = memoria_compartida.publicar_notas(df, origen, os.path.getmtime(origen))
+    assert stat.S_IMODE(os.stat(ruta).st_mode) == 0o600
+
+
+def test_cada_archivo_de_notas_tiene_su_segmento(directorio):
+    _, origen_a = _notas(directorio, "curso_a.xlsx")
+    _, origen_b = _notas(directorio, "curso_b.xlsx")
+    assert memoria_compartida.ruta_segmento(origen_a) != memoria_compartida.ruta_segmento(origen_b)
+
+
+def test_reemplazo_no_afecta_al_segmento_abierto(directorio):
+    df, origen = _notas(directorio)
+    ruta = memoria_compartida.publicar_notas(df, origen, os.path.getmtime(origen))
+    anterior = memoria_compartida.SegmentoNotas(ruta)
+    adjunto = memoria_compartida.adjuntar_notas(anterior)
+
+    memoria_compartida.publicar_notas(df.iloc[:1], origen, os.path.getmtime(origen))
+    nuevo = memoria_compartida.SegmentoNotas(ruta)
+
+    assert nuevo.identificador != anterior.identificador
+    assert nuevo.cabecera['filas'] == 1
+    assert len(adjunto) == 2 and adjunto.loc[0, 'Quiz 1'] == 18.0